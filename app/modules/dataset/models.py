@@ -160,6 +160,10 @@ class DataSet(db.Model):
 
 
 class DSDownloadRecord(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('dataset_id', 'download_cookie', name='uq_ds_download_record_dataset_cookie'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     dataset_id = db.Column(db.Integer, db.ForeignKey('data_set.id'))
@@ -176,6 +180,10 @@ class DSDownloadRecord(db.Model):
 
 
 class DSViewRecord(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('dataset_id', 'view_cookie', name='uq_ds_view_record_dataset_cookie'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     dataset_id = db.Column(db.Integer, db.ForeignKey('data_set.id'))
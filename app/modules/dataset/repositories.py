@@ -1,9 +1,11 @@
 from datetime import datetime, timezone
 import logging
 from flask_login import current_user
-from typing import Optional
+from typing import List, Optional
 
-from sqlalchemy import desc, func
+from sqlalchemy import delete, desc, func, insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import selectinload
 
 from app.modules.dataset.models import (
     Author,
@@ -13,6 +15,7 @@ from app.modules.dataset.models import (
     DSViewRecord,
     DataSet
 )
+from app.modules.featuremodel.models import FMMetaData, FeatureModel
 from core.repositories.BaseRepository import BaseRepository
 
 logger = logging.getLogger(__name__)
@@ -22,29 +25,33 @@ class AuthorRepository(BaseRepository):
     def __init__(self):
         super().__init__(Author)
 
+    def replace_ds_meta_data_authors(self, ds_meta_data_id: int, authors: List[dict]):
+        # One DELETE and one multi-row INSERT, regardless of the number of authors
+        self.session.execute(delete(Author).where(Author.ds_meta_data_id == ds_meta_data_id))
+        if authors:
+            self.session.execute(
+                insert(Author), [dict(ds_meta_data_id=ds_meta_data_id, **author) for author in authors]
+            )
+
 
 class DSDownloadRecordRepository(BaseRepository):
     def __init__(self):
         super().__init__(DSDownloadRecord)
 
     def total_dataset_downloads(self) -> int:
-        max_id = self.model.query.with_entities(func.max(self.model.id)).scalar()
-        return max_id if max_id is not None else 0
+        # Duplicate inserts that are ignored still use up AUTO_INCREMENT ids, so count rows instead of max(id)
+        return self.model.query.with_entities(func.count(self.model.id)).scalar()
 
-    def the_record_exists(self, dataset: DataSet, user_cookie: str):
-        return self.model.query.filter_by(
+    def create_if_not_exists(self, dataset: DataSet, user_cookie: str):
+        # Single round-trip: the unique (dataset_id, download_cookie) key turns duplicates into a no-op
+        statement = mysql_insert(self.model).values(
             user_id=current_user.id if current_user.is_authenticated else None,
             dataset_id=dataset.id,
-            download_cookie=user_cookie
-        ).first()
-
-    def create_new_record(self, dataset: DataSet, user_cookie: str) -> DSDownloadRecord:
-        return self.create(
-                user_id=current_user.id if current_user.is_authenticated else None,
-                dataset_id=dataset.id,
-                download_date=datetime.now(timezone.utc),
-                download_cookie=user_cookie,
-            )
+            download_date=datetime.now(timezone.utc),
+            download_cookie=user_cookie,
+        )
+        self.session.execute(statement.on_duplicate_key_update(id=self.model.id))
+        self.session.commit()
 
 
 class DSMetaDataRepository(BaseRepository):
@@ -60,29 +67,38 @@ class DSViewRecordRepository(BaseRepository):
         super().__init__(DSViewRecord)
 
     def total_dataset_views(self) -> int:
-        max_id = self.model.query.with_entities(func.max(self.model.id)).scalar()
-        return max_id if max_id is not None else 0
+        # Duplicate inserts that are ignored still use up AUTO_INCREMENT ids, so count rows instead of max(id)
+        return self.model.query.with_entities(func.count(self.model.id)).scalar()
 
-    def the_record_exists(self, dataset: DataSet, user_cookie: str):
-        return self.model.query.filter_by(
+    def create_if_not_exists(self, dataset: DataSet, user_cookie: str):
+        # Single round-trip: the unique (dataset_id, view_cookie) key turns duplicates into a no-op
+        statement = mysql_insert(self.model).values(
             user_id=current_user.id if current_user.is_authenticated else None,
             dataset_id=dataset.id,
-            view_cookie=user_cookie
-        ).first()
-
-    def create_new_record(self, dataset: DataSet, user_cookie: str) -> DSViewRecord:
-        return self.create(
-                user_id=current_user.id if current_user.is_authenticated else None,
-                dataset_id=dataset.id,
-                view_date=datetime.now(timezone.utc),
-                view_cookie=user_cookie,
-            )
+            view_date=datetime.now(timezone.utc),
+            view_cookie=user_cookie,
+        )
+        self.session.execute(statement.on_duplicate_key_update(id=self.model.id))
+        self.session.commit()
 
 
 class DataSetRepository(BaseRepository):
     def __init__(self):
         super().__init__(DataSet)
 
+    def get_for_edit(self, dataset_id: int) -> Optional[DataSet]:
+        return (
+            self.model.query.options(
+                selectinload(DataSet.ds_meta_data).selectinload(DSMetaData.authors),
+                selectinload(DataSet.feature_models)
+                .selectinload(FeatureModel.fm_meta_data)
+                .selectinload(FMMetaData.authors),
+                selectinload(DataSet.feature_models).selectinload(FeatureModel.files),
+            )
+            .filter(DataSet.id == dataset_id)
+            .first()
+        )
+
     def get_synchronized(self, current_user_id: int) -> DataSet:
         return (
             self.model.query.join(DSMetaData)
@@ -4,6 +4,7 @@ import json
 import shutil
 
 from flask import (
+    Response,
     abort,
     jsonify,
     make_response,
@@ -11,6 +12,7 @@ from flask import (
     render_template,
     request,
     send_from_directory,
+    stream_with_context,
     url_for,
 )
 from flask_login import login_required, current_user
@@ -115,8 +117,12 @@ def create_dataset():
 @login_required
 @is_dataset_owner
 def edit_dataset(dataset_id):
-    dataset = dataset_service.get_or_404(dataset_id)
-    form = DataSetForm(obj=dataset)
+    dataset = dataset_service.get_for_edit(dataset_id)
+
+    if not dataset:
+        abort(404)
+
+    form = DataSetForm()
     form = dataset_service.populate_form_from_dataset(form=form, dataset=dataset)
     is_edit = True
     return render_template("dataset/create_and_edit_dataset.html", form=form,
@@ -178,18 +184,26 @@ def download_dataset(dataset_id):
 
     dataset = dataset_service.get_or_404(dataset_id)
 
-    temp_dir = dataset_service.zip_dataset(dataset)
+    cache_dir = dataset_service.get_zip_cache_dir(dataset)
 
     user_cookie = ds_download_record_service.create_cookie(dataset)
 
-    resp = make_response(
-        send_from_directory(
-            temp_dir,
-            f"dataset_{dataset.id}.zip",
-            as_attachment=True,
+    if dataset_service.get_cached_zip(dataset, cache_dir):
+        resp = make_response(
+            send_from_directory(
+                cache_dir,
+                f"dataset_{dataset.id}.zip",
+                as_attachment=True,
+                mimetype="application/zip",
+            )
+        )
+    else:
+        # Stream the ZIP while it is built, saving it to the cache for later downloads
+        resp = Response(
+            stream_with_context(dataset_service.stream_dataset(dataset, cache_dir=cache_dir)),
             mimetype="application/zip",
+            headers={"Content-Disposition": f"attachment; filename=dataset_{dataset.id}.zip"},
         )
-    )
 
     resp.set_cookie("download_cookie", user_cookie)
 
@@ -1,18 +1,21 @@
+import errno
 import logging
 import os
 import hashlib
+import io
 import shutil
-import tempfile
-from typing import Optional
+from typing import Iterator, Optional
 import uuid
-from zipfile import ZipFile
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import ZIP_STORED, ZipFile, ZipInfo
 
+import xxhash
 from flask import request
 
 from app.modules.auth.models import User
 from app.modules.auth.services import AuthenticationService
-from app.modules.dataset.forms import AuthorForm, DataSetForm, FeatureModelForm
-from app.modules.dataset.models import DSDownloadRecord, DSViewRecord, DataSet, DSMetaData
+from app.modules.dataset.forms import DataSetForm
+from app.modules.dataset.models import Author, DataSet, DSMetaData
 from app.modules.dataset.repositories import (
     AuthorRepository,
     DOIMappingRepository,
@@ -21,7 +24,9 @@ from app.modules.dataset.repositories import (
     DSViewRecordRepository,
     DataSetRepository
 )
+from app.modules.featuremodel.models import FMMetaData, FeatureModel
 from app.modules.featuremodel.repositories import FMMetaDataRepository, FeatureModelRepository
+from app.modules.hubfile.models import Hubfile
 from app.modules.hubfile.repositories import (
     HubfileDownloadRecordRepository,
     HubfileRepository,
@@ -31,13 +36,97 @@ from core.services.BaseService import BaseService
 
 logger = logging.getLogger(__name__)
 
+# Environment is loaded once at startup and does not change while the process runs
+DOMAIN = os.getenv('DOMAIN', 'localhost')
+WORKING_DIR = os.getenv('WORKING_DIR', '')
 
-def calculate_checksum_and_size(file_path):
-    file_size = os.path.getsize(file_path)
-    with open(file_path, "rb") as file:
-        content = file.read()
-        hash_md5 = hashlib.md5(content).hexdigest()
-        return hash_md5, file_size
+# Algorithms available for file checksums; HASH_ALGO picks the one used for new uploads
+CHECKSUM_ALGORITHMS = {
+    "md5": hashlib.md5,
+    "blake2b": lambda: hashlib.blake2b(digest_size=16),
+    "xxh3": xxhash.xxh3_128,
+}
+HASH_ALGO = os.getenv('HASH_ALGO', 'md5')
+if HASH_ALGO not in CHECKSUM_ALGORITHMS:
+    raise ValueError(f"Unsupported HASH_ALGO '{HASH_ALGO}', expected one of: {', '.join(CHECKSUM_ALGORITHMS)}")
+
+CHECKSUM_CHUNK_SIZE = 1 << 20  # 1 MiB
+ZIP_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# (unit, power of two) pairs, indexed by floor(log1024(size))
+SIZE_UNITS = (('bytes', 0), ('KB', 10), ('MB', 20), ('GB', 30), ('TB', 40))
+
+# Process-wide old DOI -> new DOI cache, cleared by DOIMappingService on every write
+NEW_DOI_CACHE_SIZE = 4096
+new_doi_cache = {}
+
+
+def new_checksum(algorithm: str = HASH_ALGO):
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise ValueError(f"Unsupported checksum algorithm: {algorithm}")
+    return CHECKSUM_ALGORITHMS[algorithm]()
+
+
+def calculate_checksum_and_size(file_path, algorithm: str = HASH_ALGO):
+    checksum = new_checksum(algorithm)
+    file_size = 0
+    # Read into one reusable buffer instead of allocating a new bytes object per chunk
+    buffer = bytearray(CHECKSUM_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as file:
+        while read := file.readinto(buffer):
+            checksum.update(view[:read])
+            file_size += read
+    return checksum.hexdigest(), file_size
+
+
+def iter_files(root: str, prefix: str = ""):
+    """Recursively yield (full_path, relative_path) for every file under root."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            relative_path = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path, relative_path + "/")
+            elif entry.is_file():
+                yield entry.path, relative_path
+
+
+class ZipStreamBuffer(io.RawIOBase):
+    """Unseekable sink for ZipFile whose written bytes are drained as they are produced."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip_chunks(root: str, arc_root: str) -> Iterator[bytes]:
+    """Build a ZIP of every file under root, yielding the archive bytes as they are written."""
+    buffer = ZipStreamBuffer()
+    # UVL files are small text files: store them uncompressed and copy in large chunks
+    with ZipFile(buffer, "w", compression=ZIP_STORED, allowZip64=True) as zipf:
+        if os.path.isdir(root):
+            for full_path, relative_path in iter_files(root):
+                zinfo = ZipInfo.from_file(full_path, arcname=arc_root + relative_path)
+                with open(full_path, "rb", buffering=0) as src, zipf.open(zinfo, "w") as dst:
+                    while chunk := src.read(ZIP_CHUNK_SIZE):
+                        dst.write(chunk)
+                        if data := buffer.drain():
+                            yield data
+    # Remaining entry data and the central directory, written when the archive is closed
+    if data := buffer.drain():
+        yield data
 
 
 class DataSetService(BaseService):
@@ -57,14 +146,24 @@ class DataSetService(BaseService):
         current_user = AuthenticationService().get_authenticated_user()
         source_dir = current_user.temp_folder()
 
-        working_dir = os.getenv("WORKING_DIR", "")
-        dest_dir = os.path.join(working_dir, "uploads", f"user_{current_user.id}", f"dataset_{dataset.id}")
+        dest_dir = os.path.join(WORKING_DIR, "uploads", f"user_{current_user.id}", f"dataset_{dataset.id}")
 
         os.makedirs(dest_dir, exist_ok=True)
 
-        for feature_model in dataset.feature_models:
-            uvl_filename = feature_model.fm_meta_data.uvl_filename
-            shutil.move(os.path.join(source_dir, uvl_filename), dest_dir)
+        uvl_filenames = [feature_model.fm_meta_data.uvl_filename for feature_model in dataset.feature_models]
+        for uvl_filename in uvl_filenames:
+            source_path = os.path.join(source_dir, uvl_filename)
+            dest_path = os.path.join(dest_dir, uvl_filename)
+            try:
+                os.replace(source_path, dest_path)
+            except OSError as exc:
+                # Source and destination on different filesystems: fall back to copy + delete
+                if exc.errno != errno.EXDEV:
+                    raise
+                shutil.move(source_path, dest_path)
+
+    def get_for_edit(self, dataset_id: int) -> Optional[DataSet]:
+        return self.repository.get_for_edit(dataset_id)
 
     def get_synchronized(self, current_user_id: int) -> DataSet:
         return self.repository.get_synchronized(current_user_id)
@@ -96,26 +195,25 @@ class DataSetService(BaseService):
     def total_dataset_views(self) -> int:
         return self.dsviewrecord_repostory.total_dataset_views()
 
-    def update_from_form(self, form: DataSetForm, current_user: User, dataset: DataSet) -> DataSet:
-        main_author = {
-            "name": f"{current_user.profile.surname}, {current_user.profile.name}",
-            "affiliation": current_user.profile.affiliation,
-            "orcid": current_user.profile.get_orcid(),
+    def get_main_author(self, current_user: User) -> dict:
+        profile = current_user.profile
+        return {
+            "name": f"{profile.surname}, {profile.name}",
+            "affiliation": profile.affiliation,
+            "orcid": profile.get_orcid(),
         }
+
+    def update_from_form(self, form: DataSetForm, current_user: User, dataset: DataSet) -> DataSet:
         try:
 
             # Update dataset metadata
-            logger.info(f"Updating dsmetadata...: {form.get_dsmetadata()}")
-            dsmetadata = self.dsmetadata_repository.update(id=dataset.ds_meta_data.id,
-                                                           **form.get_dsmetadata())
+            dsmetadata_info = form.get_dsmetadata()
+            logger.info("Updating dsmetadata...: %s", dsmetadata_info)
+            dsmetadata = self.dsmetadata_repository.update(id=dataset.ds_meta_data.id, **dsmetadata_info)
 
             # Update authors
-            dsmetadata_info = form.get_dsmetadata()
             is_anonymous = dsmetadata_info.get('dataset_anonymous', False)
 
-            self.author_repository.delete_by_column(column_name="ds_meta_data_id",
-                                                    value=dataset.ds_meta_data.id)
-
             if is_anonymous:
                 author_list = form.get_anonymous_authors()
             else:
@@ -123,11 +221,10 @@ class DataSetService(BaseService):
                 if other_authors:
                     author_list = other_authors
                 else:
-                    author_list = [main_author]
+                    author_list = [self.get_main_author(current_user)]
 
-            for author_data in author_list:
-                author = self.author_repository.create(commit=False, ds_meta_data_id=dsmetadata.id, **author_data)
-                dsmetadata.authors.append(author)
+            self.author_repository.replace_ds_meta_data_authors(dsmetadata.id, author_list)
+            self.repository.session.expire(dsmetadata, ["authors"])
 
             #   Save updated data in local
             self.repository.session.commit()
@@ -137,59 +234,66 @@ class DataSetService(BaseService):
             self.repository.session.rollback()
             raise exc
 
-        return self.get_by_id(dataset.id)
+        return dataset
 
     def create_from_form(self, form: DataSetForm, current_user: User) -> DataSet:
 
         dataset = None
 
-        main_author = {
-            "name": f"{current_user.profile.surname}, {current_user.profile.name}",
-            "affiliation": current_user.profile.affiliation,
-            "orcid": current_user.profile.get_orcid(),
-        }
+        temp_dir = current_user.temp_folder()
         try:
-            logger.info(f"Creating dsmetadata...: {form.get_dsmetadata()}")
-            dsmetadata = self.dsmetadata_repository.create(**form.get_dsmetadata())
-
-            dsmetadata_info = form.get_dsmetadata()
-            is_anonymous = dsmetadata_info.get('dataset_anonymous', False)
-
-            if is_anonymous:
-                author_list = form.get_anonymous_authors()
+            # hashlib releases the GIL while hashing, so checksums can be computed in parallel
+            file_paths = [
+                os.path.join(temp_dir, feature_model.uvl_filename.data)
+                for feature_model in form.feature_models
+            ]
+            if len(file_paths) <= 1:
+                checksums_and_sizes = [calculate_checksum_and_size(file_path) for file_path in file_paths]
             else:
-                other_authors = form.get_authors()
-                if other_authors:
-                    author_list = other_authors
-                else:
-                    author_list = [main_author]
-
-            for author_data in author_list:
-                author = self.author_repository.create(commit=False, ds_meta_data_id=dsmetadata.id, **author_data)
-                dsmetadata.authors.append(author)
+                max_workers = min(len(file_paths), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    checksums_and_sizes = list(executor.map(calculate_checksum_and_size, file_paths))
 
-            dataset = self.create(commit=False, user_id=current_user.id, ds_meta_data_id=dsmetadata.id)
+            session = self.repository.session
+            with session.no_autoflush:
+                dsmetadata_info = form.get_dsmetadata()
+                logger.info("Creating dsmetadata...: %s", dsmetadata_info)
+                dsmetadata = DSMetaData(**dsmetadata_info)
 
-            for feature_model in form.feature_models:
-                uvl_filename = feature_model.uvl_filename.data
-                fmmetadata = self.fmmetadata_repository.create(commit=False, **feature_model.get_fmmetadata())
-                for author_data in feature_model.get_authors():
-                    author = self.author_repository.create(commit=False, fm_meta_data_id=fmmetadata.id, **author_data)
-                    fmmetadata.authors.append(author)
+                is_anonymous = dsmetadata_info.get('dataset_anonymous', False)
 
-                fm = self.feature_model_repository.create(
-                    commit=False, data_set_id=dataset.id, fm_meta_data_id=fmmetadata.id
-                )
-
-                # associated files in feature model
-                file_path = os.path.join(current_user.temp_folder(), uvl_filename)
-                checksum, size = calculate_checksum_and_size(file_path)
+                if is_anonymous:
+                    author_list = form.get_anonymous_authors()
+                else:
+                    other_authors = form.get_authors()
+                    if other_authors:
+                        author_list = other_authors
+                    else:
+                        author_list = [self.get_main_author(current_user)]
+
+                dsmetadata.authors = [Author(**author_data) for author_data in author_list]
+
+                # Build the whole tree in memory, linked through relationships,
+                # and let the commit insert it with the foreign keys filled in
+                dataset = DataSet(user_id=current_user.id, ds_meta_data=dsmetadata, feature_models=[
+                    FeatureModel(
+                        fm_meta_data=FMMetaData(
+                            authors=[Author(**author_data) for author_data in feature_model.get_authors()],
+                            **feature_model.get_fmmetadata()
+                        ),
+                        # associated files in feature model
+                        files=[Hubfile(
+                            name=feature_model.uvl_filename.data,
+                            checksum=checksum,
+                            checksum_algorithm=HASH_ALGO,
+                            size=size,
+                        )],
+                    )
+                    for feature_model, (checksum, size) in zip(form.feature_models, checksums_and_sizes)
+                ])
+                session.add(dataset)
 
-                file = self.hubfilerepository.create(
-                    commit=False, name=uvl_filename, checksum=checksum, size=size, feature_model_id=fm.id
-                )
-                fm.files.append(file)
-            self.repository.session.commit()
+            session.commit()
         except Exception as exc:
             logger.info(f"Exception creating dataset from form...: {exc}")
             self.repository.session.rollback()
@@ -200,46 +304,30 @@ class DataSetService(BaseService):
     def populate_form_from_dataset(self, form: DataSetForm, dataset: DataSet):
         ds_meta_data = dataset.ds_meta_data
 
-        form.title.data = ds_meta_data.title
-        form.desc.data = ds_meta_data.description
-        form.publication_type.data = ds_meta_data.publication_type.value
-        form.publication_doi.data = ds_meta_data.publication_doi
-        form.dataset_doi.data = ds_meta_data.dataset_doi
-        form.tags.data = ds_meta_data.tags
-        form.dataset_anonymous.data = ds_meta_data.dataset_anonymous
-
-        # Populate authors
-        form.authors.entries = []  # Clear existing entries
-        for author in ds_meta_data.authors:
-            author_form = AuthorForm()
-            author_form.name.data = author.name
-            author_form.affiliation.data = author.affiliation
-            author_form.orcid.data = author.orcid
-            form.authors.append_entry(author_form)
-
-        # Populate feature models
-        form.feature_models.entries = []  # Clear existing entries
-        for fm in dataset.feature_models:
-            fm_meta_data = fm.fm_meta_data
-            fm_form = FeatureModelForm()
-            fm_form.uvl_filename.data = fm_meta_data.uvl_filename
-            fm_form.title.data = fm_meta_data.title
-            fm_form.desc.data = fm_meta_data.description
-            fm_form.publication_type.data = fm_meta_data.publication_type.value
-            fm_form.publication_doi.data = fm_meta_data.publication_doi
-            fm_form.tags.data = fm_meta_data.tags
-            fm_form.version.data = fm_meta_data.uvl_version
-
-            # Populate authors for feature model
-            fm_form.authors.entries = []  # Clear existing entries
-            for author in fm_meta_data.authors:
-                author_form = AuthorForm()
-                author_form.name.data = author.name
-                author_form.affiliation.data = author.affiliation
-                author_form.orcid.data = author.orcid
-                fm_form.authors.append_entry(author_form)
-
-            form.feature_models.append_entry(fm_form)
+        # Bind the whole form tree, including nested author lists, in a single pass
+        form.process(formdata=None, data={
+            "title": ds_meta_data.title,
+            "desc": ds_meta_data.description,
+            "publication_type": ds_meta_data.publication_type.value,
+            "publication_doi": ds_meta_data.publication_doi,
+            "dataset_doi": ds_meta_data.dataset_doi,
+            "tags": ds_meta_data.tags,
+            "dataset_anonymous": ds_meta_data.dataset_anonymous,
+            "authors": [author.to_dict() for author in ds_meta_data.authors],
+            "feature_models": [
+                {
+                    "uvl_filename": fm.fm_meta_data.uvl_filename,
+                    "title": fm.fm_meta_data.title,
+                    "desc": fm.fm_meta_data.description,
+                    "publication_type": fm.fm_meta_data.publication_type.value,
+                    "publication_doi": fm.fm_meta_data.publication_doi,
+                    "tags": fm.fm_meta_data.tags,
+                    "version": fm.fm_meta_data.uvl_version,
+                    "authors": [author.to_dict() for author in fm.fm_meta_data.authors],
+                }
+                for fm in dataset.feature_models
+            ],
+        })
 
         return form
 
@@ -247,29 +335,77 @@ class DataSetService(BaseService):
         return self.dsmetadata_repository.update(id, **kwargs)
 
     def get_uvlhub_doi(self, dataset: DataSet) -> str:
-        domain = os.getenv('DOMAIN', 'localhost')
-        return f'http://{domain}/doi/{dataset.ds_meta_data.dataset_doi}'
-
-    def zip_dataset(self, dataset: DataSet) -> str:
-        file_path = f"uploads/user_{dataset.user_id}/dataset_{dataset.id}/"
-        temp_dir = tempfile.mkdtemp()
-        zip_path = os.path.join(temp_dir, f"dataset_{dataset.id}.zip")
-
-        with ZipFile(zip_path, "w") as zipf:
-            for subdir, dirs, files in os.walk(file_path):
-                for file in files:
-                    full_path = os.path.join(subdir, file)
-
-                    relative_path = os.path.relpath(full_path, file_path)
-
-                    zipf.write(
-                        full_path,
-                        arcname=os.path.join(
-                            os.path.basename(zip_path[:-4]), relative_path
-                        ),
-                    )
+        return f'http://{DOMAIN}/doi/{dataset.ds_meta_data.dataset_doi}'
+
+    def get_upload_path(self, dataset: DataSet) -> str:
+        return f"uploads/user_{dataset.user_id}/dataset_{dataset.id}/"
+
+    def get_zip_cache_dir(self, dataset: DataSet) -> str:
+        """
+        Absolute directory holding the cached ZIP. It is keyed by the name, size and modification time
+        of every dataset file, so adding, removing or replacing any file selects a new directory.
+        """
+        file_path = self.get_upload_path(dataset)
+        signature = hashlib.blake2b(digest_size=8)
+        if os.path.isdir(file_path):
+            for full_path, relative_path in sorted(iter_files(file_path), key=lambda file: file[1]):
+                stat = os.stat(full_path)
+                signature.update(f"{relative_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+        return os.path.abspath(
+            os.path.join(WORKING_DIR, "uploads", ".cache", f"dataset_{dataset.id}_{signature.hexdigest()}")
+        )
+
+    def get_cached_zip(self, dataset: DataSet, cache_dir: Optional[str] = None) -> Optional[str]:
+        cache_dir = cache_dir or self.get_zip_cache_dir(dataset)
+        if os.path.exists(os.path.join(cache_dir, f"dataset_{dataset.id}.zip")):
+            return cache_dir
+        return None
+
+    def stream_dataset(self, dataset: DataSet, cache_dir: Optional[str] = None) -> Iterator[bytes]:
+        """
+        Yield the dataset ZIP while it is being built, so sending overlaps with reading the files.
+        If cache_dir is given, the archive is also saved there once complete.
+        """
+        file_path = self.get_upload_path(dataset)
+        arc_root = f"dataset_{dataset.id}/"
+
+        cache_file = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            zip_path = os.path.join(cache_dir, f"dataset_{dataset.id}.zip")
+            # Unique temporary name so concurrent builds never read or clobber a partial archive
+            temp_path = f"{zip_path}.{uuid.uuid4().hex}.tmp"
+            cache_file = open(temp_path, "wb")
 
-        return temp_dir
+        try:
+            for chunk in iter_zip_chunks(file_path, arc_root):
+                if cache_file:
+                    cache_file.write(chunk)
+                yield chunk
+        except BaseException:
+            if cache_file:
+                cache_file.close()
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            raise
+
+        if cache_file:
+            cache_file.close()
+            try:
+                os.replace(temp_path, zip_path)
+            except FileNotFoundError:
+                # A build for newer files pruned this directory meanwhile; this archive is stale anyway
+                return
+            self.prune_zip_cache(dataset, keep=cache_dir)
+
+    def prune_zip_cache(self, dataset: DataSet, keep: str):
+        """Remove the dataset's cached ZIPs for older file signatures, keeping only the keep directory."""
+        cache_root, keep_name = os.path.split(keep)
+        prefix = f"dataset_{dataset.id}_"
+        with os.scandir(cache_root) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and entry.name != keep_name and entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
 
 
 class AuthorService(BaseService):
@@ -281,22 +417,11 @@ class DSDownloadRecordService(BaseService):
     def __init__(self):
         super().__init__(DSDownloadRecordRepository())
 
-    def the_record_exists(self, dataset: DataSet, user_cookie: str):
-        return self.repository.the_record_exists(dataset, user_cookie)
-
-    def create_new_record(self, dataset: DataSet,  user_cookie: str) -> DSDownloadRecord:
-        return self.repository.create_new_record(dataset, user_cookie)
-
     def create_cookie(self, dataset: DataSet) -> str:
 
-        user_cookie = request.cookies.get("download_cookie")
-        if not user_cookie:
-            user_cookie = str(uuid.uuid4())
+        user_cookie = request.cookies.get("download_cookie") or str(uuid.uuid4())
 
-        existing_record = self.the_record_exists(dataset=dataset, user_cookie=user_cookie)
-
-        if not existing_record:
-            self.create_new_record(dataset=dataset, user_cookie=user_cookie)
+        self.repository.create_if_not_exists(dataset=dataset, user_cookie=user_cookie)
 
         return user_cookie
 
@@ -316,22 +441,11 @@ class DSViewRecordService(BaseService):
     def __init__(self):
         super().__init__(DSViewRecordRepository())
 
-    def the_record_exists(self, dataset: DataSet, user_cookie: str):
-        return self.repository.the_record_exists(dataset, user_cookie)
-
-    def create_new_record(self, dataset: DataSet,  user_cookie: str) -> DSViewRecord:
-        return self.repository.create_new_record(dataset, user_cookie)
-
     def create_cookie(self, dataset: DataSet) -> str:
 
-        user_cookie = request.cookies.get("view_cookie")
-        if not user_cookie:
-            user_cookie = str(uuid.uuid4())
+        user_cookie = request.cookies.get("view_cookie") or str(uuid.uuid4())
 
-        existing_record = self.the_record_exists(dataset=dataset, user_cookie=user_cookie)
-
-        if not existing_record:
-            self.create_new_record(dataset=dataset, user_cookie=user_cookie)
+        self.repository.create_if_not_exists(dataset=dataset, user_cookie=user_cookie)
 
         return user_cookie
 
@@ -340,13 +454,38 @@ class DOIMappingService(BaseService):
     def __init__(self):
         super().__init__(DOIMappingRepository())
 
-    def get_new_doi(self, old_doi: str) -> str:
+    def get_new_doi(self, old_doi: str) -> Optional[str]:
+        # Only found mappings are cached: a miss must keep querying the database, so a mapping
+        # added by another worker (or directly in the database) becomes visible immediately.
+        new_doi = new_doi_cache.get(old_doi)
+        if new_doi is not None:
+            return new_doi
+
         doi_mapping = self.repository.get_new_doi(old_doi)
-        if doi_mapping:
-            return doi_mapping.dataset_doi_new
-        else:
+        if not doi_mapping:
             return None
 
+        if len(new_doi_cache) >= NEW_DOI_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            new_doi_cache.pop(next(iter(new_doi_cache)), None)
+        new_doi_cache[old_doi] = doi_mapping.dataset_doi_new
+        return doi_mapping.dataset_doi_new
+
+    def create(self, **kwargs):
+        instance = super().create(**kwargs)
+        new_doi_cache.clear()
+        return instance
+
+    def update(self, id, **kwargs):
+        instance = super().update(id, **kwargs)
+        new_doi_cache.clear()
+        return instance
+
+    def delete(self, id):
+        deleted = super().delete(id)
+        new_doi_cache.clear()
+        return deleted
+
 
 class SizeService():
 
@@ -354,11 +493,8 @@ class SizeService():
         pass
 
     def get_human_readable_size(self, size: int) -> str:
-        if size < 1024:
+        index = min(max(0, (size.bit_length() - 1) // 10), len(SIZE_UNITS) - 1)
+        if index == 0:
             return f'{size} bytes'
-        elif size < 1024 ** 2:
-            return f'{round(size / 1024, 2)} KB'
-        elif size < 1024 ** 3:
-            return f'{round(size / (1024 ** 2), 2)} MB'
-        else:
-            return f'{round(size / (1024 ** 3), 2)} GB'
+        unit, shift = SIZE_UNITS[index]
+        return f'{round(size / (1 << shift), 2)} {unit}'
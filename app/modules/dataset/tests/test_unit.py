@@ -0,0 +1,319 @@
+import contextlib
+import hashlib
+import io
+import os
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import xxhash
+from sqlalchemy.dialects import mysql
+
+from app import db
+from app.modules.auth.models import User
+from app.modules.dataset import repositories
+from app.modules.dataset.models import DataSet, DSDownloadRecord, DSMetaData, DSViewRecord, PublicationType
+from app.modules.dataset.repositories import DSDownloadRecordRepository, DSViewRecordRepository
+from app.modules.dataset.services import (
+    CHECKSUM_CHUNK_SIZE,
+    HASH_ALGO,
+    ZIP_CHUNK_SIZE,
+    DataSetService,
+    DOIMappingService,
+    SizeService,
+    calculate_checksum_and_size,
+    new_doi_cache
+)
+
+
+@pytest.fixture(scope='module')
+def test_client(test_client):
+    """
+    Extends the test_client fixture to add additional specific data for module testing.
+    """
+    with test_client.application.app_context():
+        # Add HERE new elements to the database that you want to exist in the test context.
+        # DO NOT FORGET to use db.session.add(<element>) and db.session.commit() to save the data.
+        user = User.query.filter_by(email='test@example.com').first()
+        ds_meta_data = DSMetaData(
+            title='Sample dataset',
+            description='Description for sample dataset',
+            publication_type=PublicationType.NONE,
+        )
+        db.session.add(DataSet(user_id=user.id, ds_meta_data=ds_meta_data))
+        db.session.commit()
+
+    yield test_client
+
+
+class FakeSession:
+    """Collects what a service adds and commits, without touching a database."""
+
+    def __init__(self):
+        self.added = []
+        self.committed = False
+        self.no_autoflush = contextlib.nullcontext()
+
+    def add(self, instance):
+        self.added.append(instance)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+
+@pytest.mark.parametrize("content", [
+    b"",
+    b"features\n    Root",
+    b"x" * (2 * CHECKSUM_CHUNK_SIZE + 5),
+])
+@pytest.mark.parametrize("algorithm, expected", [
+    ("md5", lambda content: hashlib.md5(content).hexdigest()),
+    ("blake2b", lambda content: hashlib.blake2b(content, digest_size=16).hexdigest()),
+    ("xxh3", lambda content: xxhash.xxh3_128(content).hexdigest()),
+])
+def test_calculate_checksum_and_size(tmp_path, content, algorithm, expected):
+    file_path = tmp_path / "file.uvl"
+    file_path.write_bytes(content)
+
+    checksum, size = calculate_checksum_and_size(str(file_path), algorithm)
+
+    assert checksum == expected(content)
+    assert size == len(content)
+
+
+def test_calculate_checksum_and_size_defaults_to_hash_algo(tmp_path):
+    file_path = tmp_path / "file.uvl"
+    file_path.write_bytes(b"features")
+
+    assert calculate_checksum_and_size(str(file_path)) == calculate_checksum_and_size(str(file_path), HASH_ALGO)
+
+
+def test_calculate_checksum_and_size_unknown_algorithm(tmp_path):
+    file_path = tmp_path / "file.uvl"
+    file_path.write_bytes(b"features")
+
+    with pytest.raises(ValueError):
+        calculate_checksum_and_size(str(file_path), "sha0")
+
+
+def test_create_from_form_records_checksum_algorithm(tmp_path):
+    (tmp_path / "file1.uvl").write_bytes(b"features\n    Root")
+
+    service = DataSetService()
+    session = FakeSession()
+    service.repository.session = session
+
+    form = SimpleNamespace(
+        get_dsmetadata=lambda: {"title": "Dataset", "dataset_anonymous": False},
+        get_authors=lambda: [{"name": "Foo, Bar", "affiliation": "", "orcid": ""}],
+        feature_models=[SimpleNamespace(
+            uvl_filename=SimpleNamespace(data="file1.uvl"),
+            get_fmmetadata=lambda: {"uvl_filename": "file1.uvl", "title": "Model"},
+            get_authors=lambda: [],
+        )],
+    )
+    user = SimpleNamespace(
+        id=1,
+        temp_folder=lambda: str(tmp_path),
+        profile=SimpleNamespace(surname="Foo", name="Bar", affiliation="", get_orcid=lambda: ""),
+    )
+
+    dataset = service.create_from_form(form=form, current_user=user)
+
+    assert session.added == [dataset] and session.committed
+    assert [author.name for author in dataset.ds_meta_data.authors] == ["Foo, Bar"]
+    [hubfile] = dataset.feature_models[0].files
+    assert hubfile.checksum_algorithm == HASH_ALGO
+    assert hubfile.checksum == calculate_checksum_and_size(str(tmp_path / "file1.uvl"))[0]
+
+
+class FakeDOIMappingRepository:
+    """Serves DOI mappings from a dict and counts the lookups that reach it."""
+
+    def __init__(self, mappings):
+        self.mappings = mappings
+        self.lookups = 0
+
+    def get_new_doi(self, old_doi):
+        self.lookups += 1
+        new_doi = self.mappings.get(old_doi)
+        return SimpleNamespace(dataset_doi_new=new_doi) if new_doi else None
+
+    def create(self, **kwargs):
+        self.mappings[kwargs["dataset_doi_old"]] = kwargs["dataset_doi_new"]
+
+    def update(self, id, **kwargs):
+        self.mappings[id] = kwargs["dataset_doi_new"]
+
+    def delete(self, id):
+        self.mappings.pop(id, None)
+        return True
+
+
+@pytest.fixture
+def doi_mapping_service():
+    new_doi_cache.clear()
+    service = DOIMappingService()
+    service.repository = FakeDOIMappingRepository({"10.1234/old": "10.1234/new"})
+    yield service
+    new_doi_cache.clear()
+
+
+def test_get_new_doi_caches_hits(doi_mapping_service):
+    assert doi_mapping_service.get_new_doi("10.1234/old") == "10.1234/new"
+    assert doi_mapping_service.get_new_doi("10.1234/old") == "10.1234/new"
+
+    assert doi_mapping_service.repository.lookups == 1
+
+
+def test_get_new_doi_does_not_cache_misses(doi_mapping_service):
+    assert doi_mapping_service.get_new_doi("10.1234/missing") is None
+
+    doi_mapping_service.repository.mappings["10.1234/missing"] = "10.1234/found"
+
+    assert doi_mapping_service.get_new_doi("10.1234/missing") == "10.1234/found"
+    assert doi_mapping_service.repository.lookups == 2
+
+
+@pytest.mark.parametrize("write", [
+    lambda service: service.create(dataset_doi_old="10.1234/other", dataset_doi_new="10.1234/other-new"),
+    lambda service: service.update("10.1234/old", dataset_doi_new="10.1234/newer"),
+    lambda service: service.delete("10.1234/old"),
+])
+def test_doi_mapping_writes_clear_cache(doi_mapping_service, write):
+    doi_mapping_service.get_new_doi("10.1234/old")
+
+    write(doi_mapping_service)
+
+    assert not new_doi_cache
+    doi_mapping_service.get_new_doi("10.1234/old")
+    assert doi_mapping_service.repository.lookups == 2
+
+
+@pytest.fixture
+def anonymous_user(monkeypatch):
+    monkeypatch.setattr(repositories, "current_user", SimpleNamespace(is_authenticated=False))
+
+
+@pytest.mark.parametrize("repository_class", [DSDownloadRecordRepository, DSViewRecordRepository])
+def test_create_if_not_exists_is_an_upsert(anonymous_user, repository_class):
+    repository = repository_class()
+    executed = []
+    repository.session = SimpleNamespace(execute=executed.append, commit=lambda: None)
+
+    repository.create_if_not_exists(dataset=SimpleNamespace(id=1), user_cookie="cookie")
+
+    [statement] = executed
+    assert "ON DUPLICATE KEY UPDATE" in str(statement.compile(dialect=mysql.dialect()))
+
+
+@pytest.mark.parametrize("repository_class, model, total", [
+    (DSDownloadRecordRepository, DSDownloadRecord, "total_dataset_downloads"),
+    (DSViewRecordRepository, DSViewRecord, "total_dataset_views"),
+])
+def test_create_if_not_exists_records_each_cookie_once(test_client, anonymous_user, repository_class, model, total):
+    dataset = DataSet.query.first()
+    repository = repository_class()
+
+    repository.create_if_not_exists(dataset=dataset, user_cookie="cookie-a")
+    repository.create_if_not_exists(dataset=dataset, user_cookie="cookie-a")
+    repository.create_if_not_exists(dataset=dataset, user_cookie="cookie-b")
+
+    assert model.query.filter_by(dataset_id=dataset.id).count() == 2
+    assert getattr(repository, total)() == 2
+
+
+def test_stream_dataset_builds_zip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    upload_dir = tmp_path / "uploads" / "user_1" / "dataset_2"
+    (upload_dir / "nested").mkdir(parents=True)
+    (upload_dir / "file1.uvl").write_bytes(b"features\n    Root")
+    (upload_dir / "nested" / "file2.uvl").write_bytes(b"x" * 10)
+
+    data = b"".join(DataSetService().stream_dataset(SimpleNamespace(id=2, user_id=1)))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        assert sorted(archive.namelist()) == ["dataset_2/file1.uvl", "dataset_2/nested/file2.uvl"]
+        assert archive.read("dataset_2/file1.uvl") == b"features\n    Root"
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist())
+
+
+def test_stream_dataset_without_uploads_is_empty_zip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    data = b"".join(DataSetService().stream_dataset(SimpleNamespace(id=2, user_id=1)))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.namelist() == []
+
+
+@pytest.fixture
+def uploaded_dataset(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    upload_dir = tmp_path / "uploads" / "user_1" / "dataset_2"
+    upload_dir.mkdir(parents=True)
+    (upload_dir / "file1.uvl").write_bytes(b"x" * (3 * ZIP_CHUNK_SIZE))
+    return SimpleNamespace(id=2, user_id=1, upload_dir=upload_dir)
+
+
+def test_get_zip_cache_dir_changes_with_files(uploaded_dataset):
+    service = DataSetService()
+    original = service.get_zip_cache_dir(uploaded_dataset)
+
+    assert os.path.isabs(original)
+    assert service.get_zip_cache_dir(uploaded_dataset) == original
+
+    (uploaded_dataset.upload_dir / "file2.uvl").write_bytes(b"features")
+    added = service.get_zip_cache_dir(uploaded_dataset)
+    assert added != original
+
+    (uploaded_dataset.upload_dir / "file2.uvl").unlink()
+    (uploaded_dataset.upload_dir / "file1.uvl").rename(uploaded_dataset.upload_dir / "file3.uvl")
+    assert service.get_zip_cache_dir(uploaded_dataset) not in (original, added)
+
+
+def test_stream_dataset_caches_zip_and_prunes_old_archives(uploaded_dataset):
+    service = DataSetService()
+    old_cache_dir = service.get_zip_cache_dir(uploaded_dataset)
+    b"".join(service.stream_dataset(uploaded_dataset, cache_dir=old_cache_dir))
+
+    (uploaded_dataset.upload_dir / "file2.uvl").write_bytes(b"features")
+    cache_dir = service.get_zip_cache_dir(uploaded_dataset)
+    data = b"".join(service.stream_dataset(uploaded_dataset, cache_dir=cache_dir))
+
+    assert service.get_cached_zip(uploaded_dataset, cache_dir) == cache_dir
+    assert (Path(cache_dir) / "dataset_2.zip").read_bytes() == data
+    assert os.listdir(cache_dir) == ["dataset_2.zip"]
+    assert not os.path.exists(old_cache_dir)
+
+
+def test_stream_dataset_removes_partial_zip_when_closed_early(uploaded_dataset):
+    service = DataSetService()
+    cache_dir = service.get_zip_cache_dir(uploaded_dataset)
+
+    stream = service.stream_dataset(uploaded_dataset, cache_dir=cache_dir)
+    next(stream)
+    stream.close()
+
+    assert os.listdir(cache_dir) == []
+    assert service.get_cached_zip(uploaded_dataset, cache_dir) is None
+
+
+@pytest.mark.parametrize("size, expected", [
+    (0, "0 bytes"),
+    (1023, "1023 bytes"),
+    (1024, "1.0 KB"),
+    (1536, "1.5 KB"),
+    (1024 ** 2, "1.0 MB"),
+    (1024 ** 3, "1.0 GB"),
+    (1024 ** 4 - 1, "1024.0 GB"),
+    (1024 ** 4, "1.0 TB"),
+    (5 * 1024 ** 5, "5120.0 TB"),
+])
+def test_get_human_readable_size(size, expected):
+    assert SizeService().get_human_readable_size(size) == expected
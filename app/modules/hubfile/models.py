@@ -11,6 +11,7 @@ class Hubfile(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
     checksum = db.Column(db.String(120), nullable=False)
+    checksum_algorithm = db.Column(db.String(16), nullable=False, default='md5', server_default='md5')
     size = db.Column(db.Integer, nullable=False)
     feature_model_id = db.Column(db.Integer, db.ForeignKey('feature_model.id'), nullable=False)
 
@@ -50,6 +51,7 @@ class Hubfile(db.Model):
             "id": self.id,
             "name": self.name,
             "checksum": self.checksum,
+            "checksum_algorithm": self.checksum_algorithm,
             "size_in_bytes": self.size,
             "size_in_human_format": self.get_formatted_size(),
             "url": url,
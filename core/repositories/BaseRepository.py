@@ -19,6 +19,14 @@ class BaseRepository(Generic[T]):
             self.session.flush()
         return instance
 
+    def create_many(self, rows: List[dict], commit: bool = True) -> List[T]:
+        instances: List[T] = [self.model(**kwargs) for kwargs in rows]
+        if instances:
+            self.session.bulk_save_objects(instances)
+        if commit:
+            self.session.commit()
+        return instances
+
     def get_by_id(self, id: int) -> Optional[T]:
         instance: Optional[T] = self.model.query.get(id)
         return instance
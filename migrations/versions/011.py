@@ -0,0 +1,43 @@
+"""unique_dataset_record_cookies
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-15 11:03:47.902615
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep only the first record per (dataset, cookie) so the unique constraints can be created
+    op.execute(
+        "DELETE FROM ds_download_record WHERE id NOT IN ("
+        "SELECT id FROM (SELECT MIN(id) AS id FROM ds_download_record "
+        "GROUP BY dataset_id, download_cookie) AS keep_rows)"
+    )
+    op.execute(
+        "DELETE FROM ds_view_record WHERE id NOT IN ("
+        "SELECT id FROM (SELECT MIN(id) AS id FROM ds_view_record "
+        "GROUP BY dataset_id, view_cookie) AS keep_rows)"
+    )
+
+    with op.batch_alter_table('ds_download_record', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_ds_download_record_dataset_cookie', ['dataset_id', 'download_cookie'])
+
+    with op.batch_alter_table('ds_view_record', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_ds_view_record_dataset_cookie', ['dataset_id', 'view_cookie'])
+
+
+def downgrade():
+    with op.batch_alter_table('ds_view_record', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_ds_view_record_dataset_cookie', type_='unique')
+
+    with op.batch_alter_table('ds_download_record', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_ds_download_record_dataset_cookie', type_='unique')